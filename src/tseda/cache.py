@@ -1,6 +1,7 @@
 """This module provides a caching mechanism for the TSeDA application,
 utilizing the `diskcache` library."""
 
+import functools
 import pathlib
 
 import appdirs
@@ -20,4 +21,19 @@ def get_cache_dir() -> pathlib.Path:
     return cache_dir
 
 
-cache = diskcache.Cache(get_cache_dir())
+@functools.cache
+def get_cache() -> diskcache.Cache:
+    """Opens the on-disk cache on first use, so importing TSeDA does not
+    create or lock the user's cache directory.
+
+    Returns:
+        diskcache.Cache: The application cache.
+    """
+    return diskcache.Cache(get_cache_dir())
+
+
+def __getattr__(name):
+    # Keep `tseda.cache.cache` working without opening it on import
+    if name == "cache":
+        return get_cache()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
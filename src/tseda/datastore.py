@@ -28,9 +28,11 @@ TreeSequence.
 - `preprocess`: Calls `make_individuals_table`and `make_sample_sets_table`.
 """
 
+import itertools
 import random
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import panel as pn
 import param
@@ -209,10 +211,8 @@ class SampleSetsTable(Viewer):
         Returns:
             Dict: dictionary of colors
         """
-        d = {}
-        for _, row in self.data.rx.value.iterrows():
-            d[row["name"]] = row.color
-        return d
+        table = self.data.rx.value
+        return dict(zip(table["name"], table["color"]))
 
     @property
     def names(self) -> Dict[int, str]:
@@ -223,11 +223,7 @@ class SampleSetsTable(Viewer):
             Dict: dictionary of indices (int) as keys and
             names (str) as values
         """
-        d = {}
-        for index, row in self.data.rx.value.iterrows():
-            d[index] = row["name"]
-
-        return d
+        return self.data.rx.value["name"].to_dict()
 
     def loc(self, i: int) -> pd.core.series.Series:
         """Returns sample set pd.core.series.Series object (dataframe row) by
@@ -376,6 +372,10 @@ class IndividualsTable(Viewer):
             Creates a dictionary mapping sample (tskit node) IDs to
             individual IDs.
 
+        sample2ind_array -> np.ndarray:
+            Creates an array mapping sample (tskit node) IDs to
+            individual IDs.
+
         samples():
             Yields all sample (tskit node) IDs present in the data.
 
@@ -556,13 +556,14 @@ class IndividualsTable(Viewer):
         """
         sample_sets = {}
         inds = self.data.rx.value
-        for _, ind in inds.iterrows():
-            if not ind.selected and only_selected:
-                continue
-            sample_set = ind.sample_set_id
+        if only_selected:
+            inds = inds[inds["selected"].astype(bool)]
+        # Iterate over the columns rather than with iterrows, which builds a
+        # Series for every individual.
+        for sample_set, nodes in zip(inds["sample_set_id"], inds["nodes"]):
             if sample_set not in sample_sets:
                 sample_sets[sample_set] = []
-            sample_sets[sample_set].extend(ind.nodes)
+            sample_sets[sample_set].extend(nodes)
         return sample_sets
 
     def get_population_ids(self) -> List[int]:
@@ -612,11 +613,32 @@ class IndividualsTable(Viewer):
         """
         inds = self.data.rx.value
         d = {}
-        for index, ind in inds.iterrows():
-            for node in ind.nodes:
+        for index, nodes in zip(inds.index, inds["nodes"]):
+            for node in nodes:
                 d[node] = index
         return d
 
+    @property
+    def sample2ind_array(self) -> np.ndarray:
+        """Maps sample (tskit node) IDs to individual IDs with an array, so
+        that many samples can be looked up in one vectorized gather.
+
+        Returns:
+            np.ndarray: An array indexed by sample ID holding the individual
+            ID of each sample, or -1 for nodes that are not samples of any
+            individual.
+        """
+        inds = self.data.rx.value
+        sizes = inds["nodes"].map(len).to_numpy()
+        samples = np.fromiter(
+            itertools.chain.from_iterable(inds["nodes"]),
+            dtype=np.int64,
+            count=sizes.sum(),
+        )
+        arr = np.full(samples.max(initial=-1) + 1, -1, dtype=np.int64)
+        arr[samples] = np.repeat(inds.index.to_numpy(), sizes)
+        return arr
+
     def samples(self):
         """Yields all sample (tskit node) IDs present in the data.
 
@@ -627,9 +649,8 @@ class IndividualsTable(Viewer):
             int: Sample (tskit node) ID from the data.
         """
 
-        for _, ind in self.data.rx.value.iterrows():
-            for node in ind.nodes:
-                yield node
+        for nodes in self.data.rx.value["nodes"]:
+            yield from nodes
 
     def loc(self, i: int) -> pd.core.series.Series:
         """Returns the individual data, pd.core.series.Series object, for a
@@ -903,9 +924,9 @@ class DataStore(param.Parameterized):
             self.tsm.ts, ind.nodes, sample_sets, windows=windows
         )
         dflist = []
-        sample_set_names = [
-            self.sample_sets_table.loc(i)["name"] for i in sample_sets
-        ]
+        sample_set_names = self.sample_sets_table.data.rx.value.loc[
+            list(sample_sets), "name"
+        ].tolist()
         if windows is None:
             for i in range(hap.shape[0]):
                 x = pd.DataFrame(hap[i, :])
@@ -255,3 +255,14 @@ class TSModel:
         @property
         def file_uuid(self):
             return self.ts.file_uuid
+
+    @property
+    def cache_key(self):
+        """Identifies the tree sequence file for results cached on disk.
+
+        Returns:
+            tuple: The resolved path, modification time and size of the
+            file, so cached results are invalidated when it is rewritten.
+        """
+        stat = self.full_path.stat()
+        return (str(self.full_path.resolve()), stat.st_mtime_ns, stat.st_size)
@@ -4,13 +4,28 @@ Provides View helper class for panel plots and helper functions common to
 pages.
 """
 
+import collections
+import functools
+import threading
+import weakref
+
 import numpy as np
 import panel as pn
 import param
 from panel.viewable import Viewer
 
+from tseda import cache as disk_cache
 from tseda.datastore import DataStore
 
+# Number of statistics results cached per tree sequence
+STATS_CACHE_SIZE = 32
+# Tree sequences are unhashable, so results are keyed by id(ts) and dropped
+# by a finalizer when the tree sequence is garbage collected.
+_stats_cache = {}
+# Statistics are computed both on the event loop and in worker threads, so
+# every access to the cache holds this lock.
+_stats_lock = threading.Lock()
+
 
 class View(Viewer):
     key = param.String()
@@ -24,11 +39,20 @@ class View(Viewer):
         return pn.Column(pn.pane.Markdown(f"# {self.title}"))
 
 
+@functools.lru_cache(maxsize=16)
 def make_windows(window_size, sequence_length):
-    """Make windows for statistics."""
+    """Make windows for statistics.
+
+    Returns a float64 array of window breakpoints, which is shared by all
+    curves plotted from the windows. Results are cached per window size and
+    sequence length, so the array is read-only.
+    """
     num_windows = int(sequence_length / window_size)
-    windows = np.linspace(0, sequence_length, num_windows + 1)
+    windows = np.linspace(
+        0, sequence_length, num_windows + 1, dtype=np.float64
+    )
     windows[-1] = sequence_length
+    windows.flags.writeable = False
     return windows
 
 
@@ -43,3 +67,56 @@ def make_sample_sets(inds):
         sample_sets[sample_set].append(ind.id)
         samples.append(ind.id)
     return sample_sets
+
+
+def get_cached_stat(ts, key):
+    """Returns a cached statistic for a tree sequence, or None if it has not
+    been computed."""
+    with _stats_lock:
+        cache = _stats_cache.get(id(ts))
+        if cache is None or key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+
+
+def compute_stat(ts, key, func, *args, disk_key=None, **kwargs):
+    """Computes a tskit statistic, reusing a cached result if available.
+
+    Results are cached per tree sequence, so the cache is invalidated when
+    the tree sequence changes, and the least recently used result is
+    evicted once `STATS_CACHE_SIZE` results are stored. If `disk_key` is
+    given, results are also persisted in the on-disk cache so they survive
+    restarts of the application. The cache may be used from several
+    threads, but the statistic itself is computed without holding its lock.
+
+    Arguments:
+        ts (tskit.TreeSequence): The tree sequence func is a method of.
+        key (tuple): The hashable inputs that determine the result, e.g.
+            statistic, mode, window size and sample sets.
+        func (Callable): The tskit statistic to compute.
+        *args: Positional arguments passed to func.
+        disk_key (tuple, optional): Identifies the tree sequence file, see
+            `TSModel.cache_key`.
+        **kwargs: Keyword arguments passed to func.
+
+    Returns:
+        np.ndarray: The computed statistic.
+    """
+    data = get_cached_stat(ts, key)
+    if data is None:
+        if disk_key is not None:
+            data = disk_cache.get_cache().get(("stats", disk_key, key))
+        if data is None:
+            data = func(*args, **kwargs)
+            if disk_key is not None:
+                disk_cache.get_cache().set(("stats", disk_key, key), data)
+        with _stats_lock:
+            cache = _stats_cache.get(id(ts))
+            if cache is None:
+                cache = _stats_cache[id(ts)] = collections.OrderedDict()
+                weakref.finalize(ts, _stats_cache.pop, id(ts), None)
+            cache[key] = data
+            if len(cache) > STATS_CACHE_SIZE:
+                cache.popitem(last=False)
+    return data
@@ -19,6 +19,7 @@ from typing import Any, Union
 
 import holoviews as hv
 import hvplot.pandas  # noqa
+import numpy as np
 import pandas as pd
 import panel as pn
 import param
@@ -229,7 +230,7 @@ class GNNHaplotype(View):
                 return (None, info_column)
             else:
                 self.individual_id_warning.visible = False
-                nodes = inds.loc[self.individual_id].nodes
+                nodes = inds.at[self.individual_id, "nodes"]
                 info_column = pn.Column(pn.pane.Markdown(""))
                 return (nodes, info_column)
         except KeyError:
@@ -336,7 +337,6 @@ class VBar(View):
             pd.DataFrame: a dataframe containing all the information for the
             GNN VBar plot.
         """
-        inds = self.datastore.individuals_table.data.rx.value
         sample_sets = self.datastore.individuals_table.sample_sets()
         samples = [
             sample for sublist in sample_sets.values() for sample in sublist
@@ -351,12 +351,15 @@ class VBar(View):
             gnn,
             columns=[i for i in sample_sets],
         )
-        samples2ind = [
-            self.datastore.individuals_table.sample2ind[i] for i in samples
-        ]
-        df["id"] = samples2ind
+        sample2ind = self.datastore.individuals_table.sample2ind_array
+        df["id"] = sample2ind[np.asarray(samples, dtype=np.int64)]
         df["sample_id"] = df.index
-        df["sample_set_id"] = [inds.loc[i].sample_set_id for i in samples2ind]
+        # Samples are concatenated set by set, so the sample set of each row
+        # follows from the set sizes.
+        df["sample_set_id"] = np.repeat(
+            list(sample_sets.keys()),
+            [len(nodes) for nodes in sample_sets.values()],
+        )
         df.set_index(["sample_set_id", "sample_id", "id"], inplace=True)
         return df
 
@@ -377,7 +380,6 @@ class VBar(View):
             return self.warning_pane
         df = self.gnn()
         sample_sets = self.datastore.sample_sets_table.data.rx.value
-        inds = self.datastore.individuals_table.data.rx.value
         color = [sample_sets.color[i] for i in df.columns]
         groups = [sample_sets.name[i] for i in df.columns]
         levels = df.index.names
@@ -388,8 +390,8 @@ class VBar(View):
         df.columns = groups
         df.reset_index(inplace=True)
         df["x"] = factors
-        samples2ind = self.datastore.individuals_table.sample2ind
-        df["name"] = [inds.loc[samples2ind[x]].name for x in df.index]
+        samples2ind = self.datastore.individuals_table.sample2ind_array
+        df["name"] = samples2ind[df.index.to_numpy()]
 
         hover = HoverTool()
         hover.tooltips = list([("name", "@name")])
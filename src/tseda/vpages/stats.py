@@ -8,34 +8,162 @@ TODO:
 - box plots
 """
 
-import ast
+import asyncio
+import concurrent.futures
+import functools
 import itertools
 from typing import Union
 
 import holoviews as hv
-import pandas as pd
+import numpy as np
 import panel as pn
 import param
 from holoviews.plotting.util import process_cmap
 
 from tseda import config
 
-from .core import View, make_windows
+from .core import View, compute_stat, get_cached_stat, make_windows
 
 hv.extension("bokeh")
 pn.extension(sizing_mode="stretch_width")
 
+# tskit statistics are CPU bound and would otherwise block the Panel event
+# loop; run them in a worker thread instead.
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+# tskit releases the GIL while computing statistics, so large requests are
+# split into batches of outputs that are computed in parallel.
+STAT_WORKERS = 4
+MIN_BATCH_SIZE = 8
+_stat_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=STAT_WORKERS
+)
+
+# Keep curve data as numpy arrays rather than letting holoviews convert
+# them to pandas DataFrames, which is its default datatype.
+CURVE_DATATYPE = ["array", "dictionary"]
+
+
+def make_overlay(windows, data, series, statistic, colors=None):
+    """Builds an overlay of one curve per series of a windowed statistic.
+
+    The statistic is wrapped in a single gridded dataset, so all curves
+    share one position array and one data buffer. Values are plotted as
+    float32, which is plenty for display and halves the data sent to the
+    browser; cached statistics keep their float64 precision.
+
+    Arguments:
+        windows (np.ndarray): The window breakpoints of the statistic.
+        data (np.ndarray): The statistic, with one column per series.
+        series (hv.Dimension): The dimension naming the series; its values
+            are the column labels.
+        statistic (hv.Dimension): The dimension of the statistic values.
+        colors (list, optional): The colors cycled over the curves. If
+            None, colors are left to be styled later.
+
+    Returns:
+        hv.NdOverlay: The curves, keyed by series.
+    """
+    position = hv.Dimension(
+        "position",
+        label="Genome position (bp)",
+        range=(0, windows[-1]),
+    )
+    dataset = hv.Dataset(
+        (windows[:-1], series.values, data.T.astype(np.float32)),
+        kdims=[position, series],
+        vdims=[statistic],
+        datatype=["grid"],
+    )
+    overlay = dataset.to(
+        hv.Curve, position, statistic, series, datatype=CURVE_DATATYPE
+    ).overlay(series.name)
+    overlay = overlay.opts(hv.opts.NdOverlay(legend_position="right"))
+    if colors is not None:
+        overlay = overlay.opts(hv.opts.Curve(color=hv.Cycle(colors)))
+    return overlay
+
+
+def fst_from_divergence(diversity, divergence, indexes):
+    """Computes windowed Fst from diversity and divergence, as tskit does.
+
+    Caching the two underlying statistics lets Fst and divergence share one
+    computation of the divergence.
+
+    Arguments:
+        diversity (np.ndarray): The diversity of each sample set, with one
+            column per sample set.
+        divergence (np.ndarray): The divergence between each pair of sample
+            sets in indexes, with one column per pair.
+        indexes (list): The pairs of sample set indexes.
+
+    Returns:
+        np.ndarray: The Fst of each pair, with one column per pair.
+    """
+    u, v = np.asarray(indexes).T
+    within = diversity[:, u] + diversity[:, v]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 1 - 2 * within / (within + 2 * divergence)
+
+
+def parallel_stat(func, sample_sets, indexes=None, **kwargs):
+    """Computes a tskit statistic in parallel batches of outputs.
+
+    Each output (a sample set, or a pair of sample set indexes for multiway
+    statistics) is independent, so outputs are split into at most
+    `STAT_WORKERS` batches of at least `MIN_BATCH_SIZE` outputs and the
+    results are joined along the last axis. Windows are not split, since
+    tskit traverses the whole tree sequence for every call.
+
+    Arguments:
+        func (Callable): The tskit statistic to compute.
+        sample_sets (list): The sample sets passed to func.
+        indexes (list, optional): The pairs of sample set indexes passed to
+            func for multiway statistics.
+        **kwargs: Keyword arguments passed to func.
+
+    Returns:
+        np.ndarray: The computed statistic.
+    """
+    outputs = sample_sets if indexes is None else indexes
+    num_batches = min(STAT_WORKERS, len(outputs) // MIN_BATCH_SIZE)
+    if num_batches <= 1:
+        if indexes is None:
+            return func(sample_sets, **kwargs)
+        return func(sample_sets, indexes=indexes, **kwargs)
+    futures = []
+    for batch in np.array_split(np.arange(len(outputs)), num_batches):
+        if indexes is None:
+            future = _stat_executor.submit(
+                func, [sample_sets[j] for j in batch], **kwargs
+            )
+        else:
+            future = _stat_executor.submit(
+                func,
+                sample_sets,
+                indexes=[indexes[j] for j in batch],
+                **kwargs,
+            )
+        futures.append(future)
+    return np.concatenate([future.result() for future in futures], axis=-1)
+
+
+@functools.lru_cache(maxsize=None)
+def colormap_list(name, provider):
+    """Returns the list of colors of a holoviews colormap."""
+    return process_cmap(name, provider=provider)
+
 
-# TODO: make sure this is safe
 def eval_comparisons(comparisons):
-    """Evaluate comparisons parameter."""
-    evaluated = ast.literal_eval(str(comparisons).replace(" & ", ","))
-    return [tuple(map(int, item.split(","))) for item in evaluated]
+    """Evaluate comparisons parameter.
 
+    Converts the "x & y" strings of the comparisons widget to tuples of
+    sample set ids.
 
-def eval_indexes(indexes):
-    """Evaluate indexes parameter."""
-    return ast.literal_eval(indexes)
+    >>> eval_comparisons(["0 & 1", "1 & 3"])
+    [(0, 1), (1, 3)]
+    """
+    return [tuple(int(x) for x in item.split(" & ")) for item in comparisons]
 
 
 class OnewayStats(View):
@@ -83,13 +211,8 @@ class OnewayStats(View):
     window_size = param.Integer(
         default=10000, bounds=(1, None), doc="Size of window"
     )
-    sample_select_warning = pn.pane.Alert(
-        """Select at least 1 sample set to see this plot.
-        Sample sets are selected on the Individuals page""",
-        alert_type="warning",
-    )
 
-    @property
+    @functools.cached_property
     def tooltip(self):
         """Returns a TooltipIcon widget containing information about the oneway
         statistical plot and how to edit it.
@@ -109,6 +232,11 @@ class OnewayStats(View):
         super().__init__(**params)
         if self.datastore.tsm.ts.time_units != "uncalibrated":
             self.param.mode.objects = ["branch", "site"]
+        self.sample_select_warning = pn.pane.Alert(
+            """Select at least 1 sample set to see this plot.
+            Sample sets are selected on the Individuals page""",
+            alert_type="warning",
+        )
 
     @param.depends("mode", "statistic", "window_size")
     def __panel__(self) -> Union[pn.Column, pn.pane.Alert]:
@@ -126,45 +254,43 @@ class OnewayStats(View):
         if len(sample_sets_ids) < 1:
             return self.sample_select_warning
         sample_sets_individuals = list(sample_sets_dictionary.values())
+        ts = self.datastore.tsm.ts
 
         if self.statistic == "Tajimas_D":
-            data = self.datastore.tsm.ts.Tajimas_D(
-                sample_sets_individuals, windows=windows, mode=self.mode
-            )
+            func = ts.Tajimas_D
             fig_text = "**Oneway Tajimas_D plot** - Lorem Ipsum"
         elif self.statistic == "diversity":
-            data = self.datastore.tsm.ts.diversity(
-                sample_sets_individuals, windows=windows, mode=self.mode
-            )
+            func = ts.diversity
             fig_text = "**Oneway Diversity plot** - Lorem Ipsum"
         else:
             raise ValueError("Invalid statistic")
-
-        data = pd.DataFrame(
-            data,
-            columns=[
-                self.datastore.sample_sets_table.names[i]
-                for i in sample_sets_ids
-            ],
+        key = (
+            self.statistic,
+            self.mode,
+            self.window_size,
+            tuple(tuple(s) for s in sample_sets_individuals),
         )
-        position = hv.Dimension(
-            "position",
-            label="Genome position (bp)",
-            range=(0, self.datastore.tsm.ts.sequence_length),
+        data = compute_stat(
+            ts,
+            key,
+            parallel_stat,
+            func,
+            sample_sets_individuals,
+            disk_key=self.datastore.tsm.cache_key,
+            windows=windows,
+            mode=self.mode,
         )
+
+        names_by_id = self.datastore.sample_sets_table.names
+        names = [names_by_id[i] for i in sample_sets_ids]
         statistic = hv.Dimension("statistic", label=self.statistic)
 
-        data_dict = {
-            ss: hv.Curve((windows, data[ss]), position, statistic).opts(
-                color=self.datastore.sample_sets_table.color_by_name[ss]
-            )
-            for ss in data.columns
-        }
-        kdims = [hv.Dimension("ss", label="Sample set")]
-        holomap = hv.HoloMap(data_dict, kdims=kdims)
+        color_by_name = self.datastore.sample_sets_table.color_by_name
+        colors = [color_by_name[name] for name in names]
+        ss = hv.Dimension("ss", label="Sample set", values=names)
         return pn.Column(
             pn.panel(
-                holomap.overlay("ss").opts(legend_position="right"),
+                make_overlay(windows, data, ss, statistic, colors),
                 sizing_mode="stretch_width",
             ),
             pn.pane.Markdown(fig_text),
@@ -215,9 +341,16 @@ class MultiwayStats(View):
         (default: "glasbey_dark")
 
     Methods:
-    set_multichoice_options():
+    set_multichoice_options(sample_sets=None):
         Updates the options for the comparisons multi-choice widget based
         on available sample sets.
+    compute(func, *args, **kwargs) -> np.ndarray:
+        Runs a tskit statistic in a worker thread, cancelling any pending
+        computation.
+    compute_cached(key, func, *args, **kwargs) -> np.ndarray:
+        Returns a cached tskit statistic, computing it if needed.
+    recolor(overlay, colormap) -> hv.NdOverlay:
+        Applies a colormap to the curves of the plot.
     __panel__() -> pn.Column:
         Generates the view containing the multiway statistics plot.
         Raises a warning if no sample sets are selected.
@@ -239,21 +372,7 @@ class MultiwayStats(View):
     window_size = param.Integer(
         default=10000, bounds=(1, None), doc="Size of window"
     )
-    comparisons = pn.widgets.MultiChoice(
-        name="Comparisons", description="Choose indexes to compare.", value=[]
-    )
-    sample_select_warning = pn.pane.Alert(
-        """Select at least 2 sample sets to see this plot.
-        Sample sets are selected on the Individuals page""",
-        alert_type="warning",
-    )
-    cmaps = {
-        cm.name: cm
-        for cm in hv.plotting.util.list_cmaps(
-            records=True, category="Categorical", reverse=False
-        )
-        if cm.name.startswith("glasbey")
-    }
+    cmaps = config.CMAP_GLASBEY
     colormap = param.Selector(
         objects=list(cmaps.keys()),
         default="glasbey_dark",
@@ -264,8 +383,20 @@ class MultiwayStats(View):
         super().__init__(**params)
         if self.datastore.tsm.ts.time_units != "uncalibrated":
             self.param.mode.objects = ["branch", "site"]
+        self.comparisons = pn.widgets.MultiChoice(
+            name="Comparisons",
+            description="Choose indexes to compare.",
+            value=[],
+        )
+        self.sample_select_warning = pn.pane.Alert(
+            """Select at least 2 sample sets to see this plot.
+            Sample sets are selected on the Individuals page""",
+            alert_type="warning",
+        )
+        self._current_future = None
+        self._last_selection_key = None
 
-    @property
+    @functools.cached_property
     def tooltip(self):
         """Returns a TooltipIcon widget containing information about the
         multiway statistical plot and how to edit it.
@@ -281,39 +412,107 @@ class MultiwayStats(View):
             )
         )
 
-    def set_multichoice_options(self):
+    def set_multichoice_options(self, sample_sets=None):
         """This method dynamically populates the `comparisons` widget with a
         list of possible sample set pairs based on the currently selected
-        sample sets in the `individuals_table`."""
-        sample_sets = self.datastore.individuals_table.sample_sets()
+        sample sets in the `individuals_table`.
+
+        Arguments:
+            sample_sets (dict, optional): The selected sample sets, if
+            already retrieved from the `individuals_table`.
+        """
+        if sample_sets is None:
+            sample_sets = self.datastore.individuals_table.sample_sets()
+        selection_key = tuple(sample_sets.keys())
+        if selection_key == self._last_selection_key:
+            return
         all_comparisons = list(
-            f"{x} & {y}"
-            for x, y in itertools.combinations(
-                list(sample_sets.keys()),
-                2,
-            )
+            f"{x} & {y}" for x, y in itertools.combinations(selection_key, 2)
         )
         self.comparisons.options = all_comparisons
+        self._last_selection_key = selection_key
 
-    @pn.depends(
-        "mode", "statistic", "window_size", "colormap", "comparisons.value"
-    )
-    def __panel__(self):
+    async def compute(self, func, *args, **kwargs):
+        """Runs a tskit statistic in a worker thread without blocking the
+        event loop. A computation that is still queued when the inputs
+        change is dropped, which raises `asyncio.CancelledError` for its
+        caller; one that has already started runs to completion.
+
+        Arguments:
+            func (Callable): The tskit statistic to compute.
+            *args: Positional arguments passed to func.
+            **kwargs: Keyword arguments passed to func.
+
+        Returns:
+            np.ndarray: The statistic computed by func.
+        """
+        if self._current_future is not None:
+            self._current_future.cancel()
+        future = _executor.submit(func, *args, **kwargs)
+        self._current_future = future
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            if self._current_future is future:
+                self._current_future = None
+
+    async def compute_cached(self, key, func, *args, **kwargs):
+        """Returns a cached tskit statistic, computing it with `compute` if
+        it has not been cached yet.
+
+        Arguments:
+            key (tuple): The hashable inputs that determine the result.
+            func (Callable): The tskit statistic to compute.
+            *args: Positional arguments passed to func.
+            **kwargs: Keyword arguments passed to func.
+
+        Returns:
+            np.ndarray: The computed statistic.
+        """
+        tsm = self.datastore.tsm
+        data = get_cached_stat(tsm.ts, key)
+        if data is None:
+            data = await self.compute(
+                compute_stat,
+                tsm.ts,
+                key,
+                parallel_stat,
+                func,
+                *args,
+                disk_key=tsm.cache_key,
+                **kwargs,
+            )
+        return data
+
+    def recolor(self, overlay, colormap):
+        """Applies a colormap to the curves of the multiway plot.
+
+        Arguments:
+            overlay (hv.NdOverlay): The curves of the multiway plot.
+            colormap (str): The name of the colormap to apply.
+
+        Returns:
+            hv.NdOverlay: A copy of the overlay with the colormap applied.
+        """
+        cmap = self.cmaps[colormap]
+        colors = colormap_list(cmap.name, cmap.provider)
+        return overlay.opts(hv.opts.Curve(color=hv.Cycle(colors)), clone=True)
+
+    @pn.depends("mode", "statistic", "window_size", "comparisons.value")
+    async def __panel__(self):
         """Returns the multiway plot.
 
         Returns:
             pn.Column: The layout for the main content area.
         """
-        self.set_multichoice_options()
+        selected_sample_sets = self.datastore.individuals_table.sample_sets()
+        self.set_multichoice_options(selected_sample_sets)
 
         data = None
         tsm = self.datastore.tsm
-        windows = []
-        colormap_list = []
         windows = make_windows(self.window_size, tsm.ts.sequence_length)
         comparisons = eval_comparisons(self.comparisons.value)
 
-        selected_sample_sets = self.datastore.individuals_table.sample_sets()
         selected_sample_sets_ids = list(selected_sample_sets.keys())
         if len(selected_sample_sets_ids) < 2:
             return self.sample_select_warning
@@ -328,70 +527,75 @@ class MultiwayStats(View):
             key: all_sample_sets[key] for key in sorted(all_sample_sets)
         }
         sample_sets_individuals = list(all_sample_sets_sorted.values())
-        comparisons_indexes = [
-            (
-                list(all_sample_sets_sorted.keys()).index(x),
-                list(all_sample_sets_sorted.keys()).index(y),
-            )
+        key_to_idx = {key: i for i, key in enumerate(all_sample_sets_sorted)}
+        comparisons = [
+            (x, y)
             for x, y in comparisons
-            if x in all_sample_sets_sorted and y in all_sample_sets_sorted
+            if x in key_to_idx and y in key_to_idx
+        ]
+        comparisons_indexes = [
+            (key_to_idx[x], key_to_idx[y]) for x, y in comparisons
         ]
         if comparisons_indexes == []:
             return pn.pane.Markdown(
                 "**Select which sample sets to compare to see this plot.**"
             )
         if self.statistic == "Fst":
-            data = tsm.ts.Fst(
-                sample_sets_individuals,
-                windows=windows,
-                indexes=comparisons_indexes,
-                mode=self.mode,
-            )
             fig_text = "**Multiway Fst plot** - Lorem Ipsum"
         elif self.statistic == "divergence":
-            data = tsm.ts.divergence(
+            fig_text = "**Multiway divergence plot** - Lorem Ipsum"
+        else:
+            raise ValueError("Invalid statistic")
+        sample_sets_key = tuple(tuple(s) for s in sample_sets_individuals)
+        try:
+            data = await self.compute_cached(
+                (
+                    "divergence",
+                    self.mode,
+                    self.window_size,
+                    sample_sets_key,
+                    tuple(comparisons_indexes),
+                ),
+                tsm.ts.divergence,
                 sample_sets_individuals,
                 windows=windows,
                 indexes=comparisons_indexes,
                 mode=self.mode,
             )
-            fig_text = "**Multiway divergence plot** - Lorem Ipsum"
-        else:
-            raise ValueError("Invalid statistic")
-        sample_sets_table = self.datastore.sample_sets_table
-        data = pd.DataFrame(
-            data,
-            columns=[
-                "-".join(
-                    [
-                        sample_sets_table.loc(i)["name"],
-                        sample_sets_table.loc(j)["name"],
-                    ]
+            if self.statistic == "Fst":
+                diversity = await self.compute_cached(
+                    (
+                        "diversity",
+                        self.mode,
+                        self.window_size,
+                        sample_sets_key,
+                    ),
+                    tsm.ts.diversity,
+                    sample_sets_individuals,
+                    windows=windows,
+                    mode=self.mode,
                 )
-                for i, j in comparisons_indexes
-            ],
+        except asyncio.CancelledError:
+            # Cancelling this render itself must propagate, but a queued
+            # computation dropped for a newer render leaves the view to it.
+            if asyncio.current_task().cancelling():
+                raise
+            raise param.Skip
+        if self.statistic == "Fst":
+            data = fst_from_divergence(diversity, data, comparisons_indexes)
+        names_by_id = self.datastore.sample_sets_table.names
+        names = [f"{names_by_id[x]}-{names_by_id[y]}" for x, y in comparisons]
+        statistic = hv.Dimension("statistic", label=self.statistic)
+        sspair = hv.Dimension(
+            "sspair", label="Sample set combination", values=names
         )
-        position = hv.Dimension(
-            "position",
-            label="Genome position (bp)",
-            range=(0, tsm.ts.sequence_length),
+        # Only the colors depend on the colormap, so changing it restyles the
+        # existing curves instead of re-running this method.
+        overlay = make_overlay(windows, data, sspair, statistic).apply(
+            self.recolor, colormap=self.param.colormap
         )
-        statistic = hv.Dimension("statistic", label=self.statistic)
-        cmap = self.cmaps[self.colormap]
-        colormap_list = process_cmap(cmap.name, provider=cmap.provider)
-        data_dict = {
-            sspair: hv.Curve(
-                (windows, data[sspair]), position, statistic
-            ).opts(color=colormap_list[i])
-            for i, sspair in enumerate(data.columns)
-        }
-        kdims = [hv.Dimension("sspair", label="Sample set combination")]
-        holomap = hv.HoloMap(data_dict, kdims=kdims)
         return pn.Column(
-            pn.panel(
-                holomap.overlay("sspair").opts(legend_position="right"),
-                sizing_mode="stretch_width",
-            ),
+            pn.panel(overlay, sizing_mode="stretch_width"),
             pn.pane.Markdown(fig_text),
         )
 
@@ -423,10 +627,10 @@ class StatsPage(View):
         The unique key for the page (default: "stats").
     title (str):
         The title of the page (default: "Statistics").
-    oneway (param.ClassSelector):
-        A parameter to select the OnewayStats class for one-way plots.
-    multiway (param.ClassSelector):
-        A parameter to select the MultiwayStats class for multi-way plots.
+    oneway (OnewayStats):
+        The view for one-way plots.
+    multiway (MultiwayStats):
+        The view for multi-way plots.
     sample_sets (SampleSetsTable):  # Assuming SampleSetsTable exists elsewhere
         The SampleSetsTable object for managing sample set information.
 
@@ -440,8 +644,6 @@ class StatsPage(View):
 
     key = "stats"
     title = "Statistics"
-    oneway = param.ClassSelector(class_=OnewayStats)
-    multiway = param.ClassSelector(class_=MultiwayStats)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -464,7 +666,9 @@ class StatsPage(View):
                 ),
                 pn.Column(
                     self.multiway.tooltip,
-                    self.multiway,
+                    pn.param.ParamMethod(
+                        self.multiway.__panel__, loading_indicator=True
+                    ),
                     name="Multiway Statistics Plot",
                 ),
                 active=[0, 1],
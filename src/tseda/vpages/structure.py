@@ -8,7 +8,6 @@ TODO:
 - add parameter to subset sample sets of interest
 """
 
-import itertools
 from typing import Union
 
 import colorcet as cc
@@ -19,7 +18,7 @@ import pandas as pd
 import panel as pn
 import param
 
-from .core import View
+from .core import View, compute_stat
 
 hv.extension("bokeh")
 pn.extension(sizing_mode="stretch_width")
@@ -33,6 +32,7 @@ class GNN(View):
         if less than two sample sets are selected.
 
     Methods:
+        gnn() -> pd.DataFrame: Computes the normalised mean GNN proportions.
         __panel__() -> Union[pn.Column, pn.pane.Alert]: Defines the GNN plot.
     """
 
@@ -42,6 +42,48 @@ class GNN(View):
         alert_type="warning",
     )
 
+    def gnn(self) -> pd.DataFrame:
+        """Computes the mean GNN proportions of each selected sample set,
+        Z-score normalised per column.
+
+        Returns:
+            pd.DataFrame: A matrix with one row per focal sample set and one
+            column per neighbouring sample set, labelled by set name.
+        """
+        sample_sets = self.datastore.individuals_table.sample_sets()
+        samples = [
+            sample for sublist in sample_sets.values() for sample in sublist
+        ]
+        sstable = self.datastore.sample_sets_table.data.rx.value
+        groups = sstable.loc[list(sample_sets), "name"].to_numpy()
+        sizes = np.array([len(nodes) for nodes in sample_sets.values()])
+        # Samples are concatenated set by set, so the rows of each focal
+        # sample set form one contiguous block starting at these offsets.
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        tsm = self.datastore.tsm
+        data = compute_stat(
+            tsm.ts,
+            ("gnn", tuple(tuple(s) for s in sample_sets.values())),
+            tsm.ts.genealogical_nearest_neighbours,
+            samples,
+            disk_key=tsm.cache_key,
+            sample_sets=list(sample_sets.values()),
+        )
+        mean_gnn = np.add.reduceat(data, starts, axis=0)
+        mean_gnn /= sizes[:, np.newaxis]
+        # Z-score normalise the columns in place with the population
+        # standard deviation, as scipy.stats.zscore does, leaving constant
+        # columns at zero.
+        mean_gnn -= mean_gnn.mean(axis=0)
+        std = mean_gnn.std(axis=0)
+        np.divide(mean_gnn, std, out=mean_gnn, where=std > 0)
+        return pd.DataFrame(
+            mean_gnn,
+            columns=groups,
+            index=pd.Index(groups, name="focal_population"),
+        )
+
     def __panel__(self) -> Union[pn.Column, pn.pane.Alert]:
         """Returns the GNN cluster plot as a heatmap or a warning message if
         less than 2 samples are selected.
@@ -51,44 +93,21 @@ class GNN(View):
             plot with a descriptive markdown element or a warning message.
         """
         sample_sets = self.datastore.individuals_table.sample_sets()
-        samples = [
-            sample for sublist in sample_sets.values() for sample in sublist
-        ]
         if len(sample_sets) <= 1:
             return self.warning_pane
         else:
-            sstable = self.datastore.sample_sets_table.data.rx.value
-            inds = self.datastore.individuals_table.data.rx.value
-            samples2ind = [
-                self.datastore.individuals_table.sample2ind[i] for i in samples
-            ]
-
-            ts = self.datastore.tsm.ts
-            data = ts.genealogical_nearest_neighbours(
-                samples, sample_sets=list(sample_sets.values())
-            )
-            df = pd.DataFrame(
-                data,
-                columns=[sstable.loc[i]["name"] for i in sample_sets],
-            )
-            df["focal_population"] = [
-                sstable.loc[inds.loc[i].sample_set_id]["name"]
-                for i in samples2ind
-            ]
-            mean_gnn = df.groupby("focal_population").mean()
-            # Z-score normalization here!
             return pn.Column(
-                mean_gnn.hvplot.heatmap(
+                self.gnn().hvplot.heatmap(
                     cmap=cc.bgy, height=300, responsive=True
                 ),
                 pn.pane.Markdown(
                     "**GNN cluster plot** - This heatmap visualizes the "
                     "genealogical relationships between individuals based on "
                     "the proportions of their genealogical nearest neighbors "
-                    "(GNN).",
+                    "(GNN). Values are Z-score normalised per column.",
                     sizing_mode="stretch_width",
                 ),
-                pn.pane.Markdown("FIXME: dendrogram and Z-score\n"),
+                pn.pane.Markdown("FIXME: dendrogram\n"),
             )
 
 
@@ -100,6 +119,7 @@ class Fst(View):
         if less than two sample sets are selected.
 
     Methods:
+        fst() -> pd.DataFrame: Computes the pairwise Fst matrix.
         __panel__() -> Union[pn.Column, pn.pane.Alert]: Defines the Fst plot.
     """
 
@@ -109,6 +129,34 @@ class Fst(View):
         alert_type="warning",
     )
 
+    def fst(self) -> pd.DataFrame:
+        """Computes Fst between every pair of selected sample sets.
+
+        Returns:
+            pd.DataFrame: A symmetric matrix with a zero diagonal, with rows
+            and columns labelled by sample set name.
+        """
+        sample_sets = self.datastore.individuals_table.sample_sets()
+        sstable = self.datastore.sample_sets_table.data.rx.value
+        tsm = self.datastore.tsm
+        k = len(sample_sets)
+        # Fst is symmetric with a zero diagonal, so only compute the upper
+        # triangle and mirror it.
+        rows, cols = np.triu_indices(k, k=1)
+        groups = sstable.loc[list(sample_sets), "name"].to_numpy()
+        fst = compute_stat(
+            tsm.ts,
+            ("Fst", "site", tuple(tuple(s) for s in sample_sets.values())),
+            tsm.ts.Fst,
+            list(sample_sets.values()),
+            disk_key=tsm.cache_key,
+            indexes=np.column_stack((rows, cols)),
+        )
+        matrix = np.zeros((k, k))
+        matrix[rows, cols] = fst
+        matrix += matrix.T
+        return pd.DataFrame(matrix, columns=groups, index=groups)
+
     def __panel__(self) -> Union[pn.Column, pn.pane.Alert]:
         """Returns the Fst plot as a heatmap or a warning message if less than
         2 samples are selected.
@@ -121,17 +169,10 @@ class Fst(View):
         if len(sample_sets) <= 1:
             return self.warning_pane
         else:
-            sstable = self.datastore.sample_sets_table.data.rx.value
-            ts = self.datastore.tsm.ts
-            k = len(sample_sets)
-            i = list(itertools.product(list(range(k)), list(range(k))))
-            groups = [sstable.loc[i]["name"] for i in sample_sets]
-            fst = ts.Fst(list(sample_sets.values()), indexes=i)
-            df = pd.DataFrame(
-                np.reshape(fst, newshape=(k, k)), columns=groups, index=groups
-            )
             return pn.Column(
-                df.hvplot.heatmap(cmap=cc.bgy, height=300, responsive=True),
+                self.fst().hvplot.heatmap(
+                    cmap=cc.bgy, height=300, responsive=True
+                ),
                 pn.pane.Markdown(
                     "**Fst Plot** - Shows the fixation index (Fst) between "
                     "different sample sets, allowing comparison of genetic "
@@ -7,9 +7,13 @@ TODO:
 """
 
 import ast
+import asyncio
+import collections
+import functools
+import itertools
 from typing import Tuple, Union
 
-import holoviews as hv
+import numpy as np
 import panel as pn
 import param
 import tskit
@@ -18,21 +22,56 @@ from tseda import config
 
 from .core import View
 
-hv.extension("bokeh")
+# Number of tree svgs kept per Tree view, so revisited trees are not redrawn
+SVG_CACHE_SIZE = 128
+# Seconds to wait for further navigation before drawing newly shown trees
+NAVIGATION_DELAY = 0.05
 
 
+@functools.lru_cache(maxsize=64)
 def eval_options(options: str) -> dict:
     """Converts the option string to a dictionary.
 
+    Results are cached per string and shared between callers, so the
+    returned dictionary must not be modified.
+
     Args:
     options (str): The options inputted by the user.
 
     Returns:
     dict: A dictionary containing the options.
+
+    >>> eval_options(" {} ")
+    {}
+    >>> eval_options("{1: 'a'}")
+    {1: 'a'}
     """
+    options = options.strip()
+    if options in ("", "{}"):
+        return {}
     return ast.literal_eval(options)
 
 
+def add_style(svg: str, style: str) -> str:
+    """Adds a css stylesheet to the end of an svg.
+
+    The stylesheet follows the default styles of tskit, so its rules take
+    precedence.
+
+    Args:
+    svg (str): The svg of a tree.
+    style (str): The css styling.
+
+    Returns:
+    str: The styled svg.
+
+    >>> add_style("<svg><g/></svg>", ".sym {fill: red}")
+    '<svg><g/><style>.sym {fill: red}</style></svg>'
+    """
+    head, _, tail = svg.rpartition("</svg>")
+    return f"{head}<style>{style}</style></svg>{tail}"
+
+
 class Tree(View):
     """This class represents a panel component for visualizing tskit trees.
 
@@ -79,17 +118,23 @@ class Tree(View):
         next_tree(self): Increments the tree index to display the next tree.
         prev_tree(self): Decrements the tree index to display the previous
         tree.
+        position_index(self): Returns the index of the tree at the selected
+        position.
         check_inputs(self): Raises a ValueError if position or tree index is
         invalid.
         handle_advanced(self): Processes advanced  options for plotting.
+        parse_options(self): Parses the node labels and additional options
+        when they change.
         update_slider(self): Updates the slider value based on the selected
         position.
         update_position(self): Updates the position based on the slider value.
         plot_tree(self, tree, omit_sites, y_ticks, node_labels,
         additional_options): Generates
         the HTML plot for a single tree with specified options.
-        get_all_trees(self, trees): Constructs a panel layout displaying all
-        provided trees.
+        tree_layout(self, tree, plot, slot): Wraps the svg of a tree with a
+        header.
+        get_all_trees(self, trees): Places all provided trees in the reusable
+        tree grid.
         multiple_trees(self): Adjusts layout and options for displaying
         multiple trees.
         advanced_options(self): Defines the layout for the advanced options
@@ -101,13 +146,6 @@ class Tree(View):
         method changes.
     """
 
-    search_by = pn.widgets.ToggleGroup(
-        name="Search By",
-        options=["Position", "Tree Index"],
-        behavior="radio",
-        button_type="primary",
-    )
-
     tree_index = param.Integer(
         default=0,
         doc="""Get tree by zero-based index. If multiple trees are
@@ -119,45 +157,9 @@ class Tree(View):
         shown, this is the position of the first tree.""",
     )
 
-    position_index_warning = pn.pane.Alert(
-        """The input for position or tree index is
-        out of bounds for the specified number
-        of trees.""",
-        alert_type="warning",
-        visible=False,
-    )
-
     width = param.Integer(default=750, doc="Width of the tree plot")
     height = param.Integer(default=520, doc="Height of the tree plot")
 
-    num_trees = pn.widgets.Select(
-        name="Number of trees",
-        options=[1, 2, 3, 4, 5, 6],
-        value=1,
-        description="""Select the number of trees to display. The first tree
-        will represent your selected chromosome position or tree index.""",
-    )
-
-    y_axis = pn.widgets.Checkbox(name="Include y-axis", value=True)
-    y_ticks = pn.widgets.Checkbox(name="Include y-ticks", value=True)
-    x_axis = pn.widgets.Checkbox(name="Include x-axis", value=False)
-    sites_mutations = pn.widgets.Checkbox(
-        name="Include sites and mutations", value=True
-    )
-    pack_unselected = pn.widgets.Checkbox(
-        name="Pack unselected sample sets", value=False, width=197
-    )
-    options_doc = pn.widgets.TooltipIcon(
-        value=(
-            """Select various elements to include in your graph.
-            Pack unselected sample sets: Selecting this option
-            will allow large polytomies involving unselected
-            samples to be summarised as a dotted line. Selection
-            of samples and sample sets can be done on the
-            Individuals page."""
-        ),
-    )
-
     symbol_size = param.Number(default=8, bounds=(0, None), doc="Symbol size")
 
     node_labels = param.String(
@@ -177,12 +179,6 @@ class Tree(View):
         ),
     )
 
-    advanced_warning = pn.pane.Alert(
-        "The inputs for the advanced options are not valid.",
-        alert_type="warning",
-        visible=False,
-    )
-
     next = param.Action(
         lambda x: x.next_tree(), doc="Next tree", label="Next tree"
     )
@@ -190,57 +186,175 @@ class Tree(View):
         lambda x: x.prev_tree(), doc="Previous tree", label="Previous tree"
     )
 
-    slider = pn.widgets.IntSlider(name="Chromosome Position")
-
     def __init__(self, **params):
+        # The widgets belong to each view rather than the class, and are
+        # created before the parameters so their dependencies resolve.
+        self.search_by = pn.widgets.ToggleGroup(
+            name="Search By",
+            options=["Position", "Tree Index"],
+            behavior="radio",
+            button_type="primary",
+        )
+        self.position_index_warning = pn.pane.Alert(
+            """The input for position or tree index is
+            out of bounds for the specified number
+            of trees.""",
+            alert_type="warning",
+            visible=False,
+        )
+        self.num_trees = pn.widgets.Select(
+            name="Number of trees",
+            options=[1, 2, 3, 4, 5, 6],
+            value=1,
+            description="""Select the number of trees to display. The first
+            tree will represent your selected chromosome position or tree
+            index.""",
+        )
+        self.y_axis = pn.widgets.Checkbox(name="Include y-axis", value=True)
+        self.y_ticks = pn.widgets.Checkbox(name="Include y-ticks", value=True)
+        self.x_axis = pn.widgets.Checkbox(name="Include x-axis", value=False)
+        self.sites_mutations = pn.widgets.Checkbox(
+            name="Include sites and mutations", value=True
+        )
+        self.pack_unselected = pn.widgets.Checkbox(
+            name="Pack unselected sample sets", value=False, width=197
+        )
+        self.options_doc = pn.widgets.TooltipIcon(
+            value=(
+                """Select various elements to include in your graph.
+                Pack unselected sample sets: Selecting this option
+                will allow large polytomies involving unselected
+                samples to be summarised as a dotted line. Selection
+                of samples and sample sets can be done on the
+                Individuals page."""
+            ),
+        )
+        self.advanced_warning = pn.pane.Alert(
+            "The inputs for the advanced options are not valid.",
+            alert_type="warning",
+            visible=False,
+        )
+        self.slider = pn.widgets.IntSlider(name="Chromosome Position")
         super().__init__(**params)
-        self.slider.end = int(self.datastore.tsm.ts.sequence_length - 1)
+        ts = self.datastore.tsm.ts
+        self.slider.end = int(ts.sequence_length - 1)
+        self._num_trees = ts.num_trees
+        self._sequence_length = ts.sequence_length
+        self._breakpoints = ts.breakpoints(as_array=True)
+        self._css_key = None
+        self._css = None
+        self._render_key = None
+        self._svg_cache = collections.OrderedDict()
+        self._tree = None
+        self._tree_tracked = None
+        self._tree_index_input = pn.widgets.IntInput.from_param(
+            self.param.tree_index
+        )
+        self._position_input = pn.widgets.IntInput.from_param(
+            self.param.position
+        )
+        self._sidebar = pn.Column(
+            pn.Card(
+                self.search_by,
+                self._tree_index_input,
+                self._position_input,
+                self.param.width,
+                self.param.height,
+                collapsed=False,
+                title="Tree plotting options",
+                header_background=config.SIDEBAR_BACKGROUND,
+                active_header_background=config.SIDEBAR_BACKGROUND,
+                styles=config.VCARD_STYLE,
+            ),
+            self.position_index_warning,
+        )
+        self._tree_header = pn.pane.HTML(sizing_mode="stretch_width")
+        # The svgs are sent as markup, as base64 encoding them would make
+        # every update a third larger.
+        self._tree_svg = pn.pane.SVG(encode=False)
+        self._tree_column = pn.Column(self._tree_header, self._tree_svg)
+        self._tree_accordions = []
+        self._trees_grid = pn.GridBox(ncols=2)
+        self._layout = pn.Column(
+            self._trees_grid,
+            pn.pane.Markdown(
+                """**Tree plot** - Lorem Ipsum...
+            Selected samples are marked with a black outline."""
+            ),
+            self.slider,
+            pn.Row(
+                self.param.prev,
+                self.param.next,
+            ),
+        )
 
     @property
     def default_css(self) -> str:
         """Default css styles for tree nodes.
 
+        The styles only depend on the color and selection of each
+        individual, so they are rebuilt only when either changes.
+
         Returns:
             str: A string with the css styling.
         """
-        styles = []
         sample_sets = self.datastore.sample_sets_table.data.rx.value
         individuals = self.datastore.individuals_table.data.rx.value
-        sample2ind = self.datastore.individuals_table.sample2ind
-        selected_sample_sets = self.datastore.individuals_table.sample_sets()
-        selected_samples = [
-            int(i)
-            for sublist in list(selected_sample_sets.values())
-            for i in sublist
-        ]
-        for n in self.datastore.individuals_table.samples():
-            ssid = individuals.loc[sample2ind[n]].sample_set_id
-            ss = sample_sets.loc[ssid]
-            if n in selected_samples:
-                s = (
-                    f".node.n{n} > .sym "
-                    + "{"
-                    + f"fill: {ss.color}; stroke: black; stroke-width: 2px;"
-                    + "}"
+        # Look up the color of every individual's sample set in one go
+        # rather than once per sample.
+        colors = (
+            sample_sets["color"]
+            .reindex(individuals["sample_set_id"])
+            .to_numpy()
+        )
+        key = (tuple(colors), tuple(individuals["selected"]))
+        if key == self._css_key:
+            return self._css
+        styles = []
+        for nodes, color, selected in zip(
+            individuals["nodes"], colors, individuals["selected"]
+        ):
+            if selected:
+                rule = (
+                    f" > .sym {{fill: {color}; "
+                    "stroke: black; stroke-width: 2px;}"
                 )
             else:
-                s = f".node.n{n} > .sym " + "{" + f"fill: {ss.color} " + "}"
-            styles.append(s)
-        css_string = " ".join(styles)
-        return css_string
+                rule = f" > .sym {{fill: {color} }}"
+            # The rule is shared by all nodes of the individual, so only the
+            # node id is formatted per sample.
+            styles.extend(f".node.n{n}{rule}" for n in nodes)
+        self._css = " ".join(styles)
+        self._css_key = key
+        return self._css
 
     def next_tree(self):
         """Increments the tree index to display the next tree."""
-        self.position = None
-        self.tree_index = min(
-            self.datastore.tsm.ts.num_trees - self.num_trees.value,
-            int(self.tree_index) + 1,
-        )  # pyright: ignore[reportOperatorIssue]
+        with param.parameterized.batch_call_watchers(self):
+            self.position = None
+            self.tree_index = min(
+                self._num_trees - self.num_trees.value,
+                self.tree_index + 1,
+            )  # pyright: ignore[reportOperatorIssue]
 
     def prev_tree(self):
         """Decrements the tree index to display the previous tree."""
-        self.position = None
-        self.tree_index = max(0, int(self.tree_index) - 1)  # pyright: ignore[reportOperatorIssue]
+        with param.parameterized.batch_call_watchers(self):
+            self.position = None
+            self.tree_index = max(0, self.tree_index - 1)  # pyright: ignore[reportOperatorIssue]
+
+    def position_index(self) -> int:
+        """Returns the index of the tree at the selected position.
+
+        Looks the position up in the tree breakpoints rather than building
+        a tskit tree for it.
+
+        Returns:
+            int: The index of the tree covering `position`.
+        """
+        return int(
+            np.searchsorted(self._breakpoints, self.position, side="right") - 1
+        )
 
     def check_inputs(self):
         """Checks the inputs for position and tree index.
@@ -248,21 +362,16 @@ class Tree(View):
         Raises
             ValueError: If the position or tree index is invalid.
         """
-        if self.position is not None:
-            if (
-                int(self.position) < 0
-                or int(self.position) >= self.datastore.tsm.ts.sequence_length
-            ):
+        num_trees = self.num_trees.value
+        position = self.position
+        if position is not None:
+            if position < 0 or position >= self._sequence_length:
                 raise ValueError
-            elif int(
-                self.datastore.tsm.ts.at(self.position).index
-                + self.num_trees.value
-            ) > int(self.datastore.tsm.ts.num_trees):
+            elif self.position_index() + num_trees > self._num_trees:
                 raise ValueError
-        if self.tree_index is not None and (
-            int(self.tree_index) < 0
-            or int(self.tree_index) + int(self.num_trees.value)
-            > self.datastore.tsm.ts.num_trees
+        tree_index = self.tree_index
+        if tree_index is not None and (
+            tree_index < 0 or tree_index + num_trees > self._num_trees
         ):
             raise ValueError
         else:
@@ -284,22 +393,46 @@ class Tree(View):
             y_ticks = None
         else:
             y_ticks = {}
+        return omit_sites, y_ticks
+
+    @param.depends(
+        "node_labels", "additional_options", watch=True, on_init=True
+    )
+    def parse_options(self):
+        """Parses the advanced options whenever they are edited, so renders
+        reuse the parsed dictionaries."""
         if self.node_labels == "":
             self.node_labels = "{}"
         if self.additional_options == "":
             self.additional_options = "{}"
-        return omit_sites, y_ticks
+        try:
+            self._node_labels = eval_options(self.node_labels)
+            self._additional_options = eval_options(self.additional_options)
+        except (ValueError, SyntaxError, TypeError):
+            self._node_labels = None
+            self._additional_options = None
+            self.advanced_warning.visible = True
 
-    @param.depends("position", watch=False)
+    @param.depends("position", watch=True)
     def update_slider(self):
-        """Updates the slider value based on the selected position."""
+        """Updates the slider value based on the selected position.
+
+        Setting the value does not change `value_throttled`, which is only
+        set by the browser, so this does not feed back into the position.
+        Events are not discarded, as the slider widget relies on them to
+        update in the browser.
+        """
         if self.position is not None:
             self.slider.value = self.position
 
-    @param.depends("slider.value_throttled", watch=False)
+    @param.depends("slider.value_throttled", watch=True)
     def update_position(self):
-        """Updates the position based on the slider value."""
-        self.position = self.slider.value
+        """Updates the position based on the slider value.
+
+        Only the throttled value is watched, so the trees are redrawn once
+        the slider is released rather than on every step.
+        """
+        self.position = self.slider.value_throttled
 
     def plot_tree(
         self,
@@ -308,9 +441,16 @@ class Tree(View):
         y_ticks: Union[None, dict],
         node_labels: dict,
         additional_options: dict,
+        style: Union[None, str] = None,
+        tracked: tuple = (),
+        slot: int = 0,
     ) -> Union[pn.Accordion, pn.Column]:
         """Plots a single tree.
 
+        The svg only depends on the structure of the tree and the plotting
+        options, so it is cached without the css styling, which is added
+        to the svg afterwards.
+
         Arguments:
             tree (tskit.trees.Tree): The tree to be plotted.
             omit_sites (bool): If sites & mutaions should be included in the
@@ -319,11 +459,37 @@ class Tree(View):
             plot.
             nodel_labels (dict): Any customised node labels.
             additional_options (dict): Any additional plotting options.
+            style (Union[None, str]): The css styling of the tree. Defaults
+            to `default_css`.
+            tracked (tuple): The tracked samples of the tree, which change
+            the svg when unselected samples are packed.
+            slot (int): The position of the tree in the tree grid.
 
         Returns:
             Union[pn.Accordion, pn.Column]: A panel element containing the
             tree.
         """
+        if style is None:
+            style = self.default_css
+        key = (
+            tree.index,
+            self.width,
+            self.height,
+            self.symbol_size,
+            self.y_axis.value,
+            self.x_axis.value,
+            omit_sites,
+            repr(y_ticks),
+            repr(node_labels),
+            repr(additional_options),
+            self.pack_unselected.value,
+            tracked if self.pack_unselected.value else None,
+        )
+        if key in self._svg_cache:
+            self._svg_cache.move_to_end(key)
+            plot, valid = self._svg_cache[key]
+            self.advanced_warning.visible = not valid
+            return self.tree_layout(tree, add_style(plot, style), slot)
         try:
             plot = tree.draw_svg(
                 size=(self.width, self.height),
@@ -334,7 +500,6 @@ class Tree(View):
                 node_labels=node_labels,
                 y_ticks=y_ticks,
                 pack_untracked_polytomies=self.pack_unselected.value,
-                style=self.default_css,
                 **additional_options,
             )
             self.advanced_warning.visible = False
@@ -343,49 +508,69 @@ class Tree(View):
                 size=(self.width, self.height),
                 y_axis=True,
                 node_labels={},
-                style=self.default_css,
             )
             self.advanced_warning.visible = True
-        pos1 = int(tree.get_interval()[0])
-        pos2 = int(tree.get_interval()[1]) - 1
-        if int(self.num_trees.value) > 1:
-            return pn.Accordion(
-                pn.Column(
-                    pn.pane.HTML(plot),
-                    name=f"Tree index {tree.index} (position {pos1} - {pos2})",
-                ),
-                active=[0],
-            )
+        self._svg_cache[key] = (plot, not self.advanced_warning.visible)
+        if len(self._svg_cache) > SVG_CACHE_SIZE:
+            self._svg_cache.popitem(last=False)
+        return self.tree_layout(tree, add_style(plot, style), slot)
+
+    def tree_layout(
+        self, tree: tskit.trees.Tree, plot: str, slot: int = 0
+    ) -> Union[pn.Accordion, pn.Column]:
+        """Wraps the svg of a tree with a header naming the tree.
+
+        The panes are kept per position in the tree grid and only their
+        contents are updated between renders.
+
+        Arguments:
+            tree (tskit.trees.Tree): The plotted tree.
+            plot (str): The svg of the tree.
+            slot (int): The position of the tree in the tree grid.
+
+        Returns:
+            Union[pn.Accordion, pn.Column]: A panel element containing the
+            tree.
+        """
+        left, right = tree.interval
+        pos1 = int(left)
+        pos2 = int(right) - 1
+        title = f"Tree index {tree.index} (position {pos1} - {pos2})"
+        if self.num_trees.value > 1:
+            while len(self._tree_accordions) <= slot:
+                self._tree_accordions.append(
+                    pn.Accordion(pn.pane.SVG(encode=False), active=[0])
+                )
+            accordion = self._tree_accordions[slot]
+            svg = accordion[0]
+            svg.object = plot
+            accordion[0] = (title, svg)
+            return accordion
         else:
-            return pn.Column(
-                pn.pane.HTML(
-                    f"<h2>Tree index {tree.index}"
-                    f" (position {pos1} - {pos2})</h2>",
-                    sizing_mode="stretch_width",
-                ),
-                pn.pane.HTML(plot),
-            )
+            self._tree_header.object = f"<h2>{title}</h2>"
+            self._tree_svg.object = plot
+            return self._tree_column
+
+    def get_all_trees(self, trees: list) -> pn.GridBox:
+        """Places all trees in the tree grid, two trees per row.
 
-    def get_all_trees(self, trees: list) -> Union[None, pn.Column]:
-        """Returns all trees in columns and rows.
+        The grid is reused across renders, so only its contents change.
 
         Arguments:
             trees: A list of all trees to be displayed.
 
         Returns:
-            Union[None, pn.Column]: A column of rows with trees,
-            if there are any trees to display.
+            pn.GridBox: The grid with the trees.
         """
-        if not trees:
-            return None
-        rows = [pn.Row(*trees[i : i + 2]) for i in range(0, len(trees), 2)]
-        return pn.Column(*rows)
+        self._trees_grid.ncols = min(2, max(1, len(trees)))
+        self._trees_grid.objects = trees
+        return self._trees_grid
 
     @param.depends("num_trees.value", watch=False)
     def multiple_trees(self):
         """Sets the default setting depending on if one or several trees are
         displayed."""
-        if int(self.num_trees.value) > 1:
+        if self.num_trees.value > 1:
             self.width = 470
             self.height = 470
             self.y_axis.value = False
@@ -452,11 +637,15 @@ class Tree(View):
         "pack_unselected.value",
         "node_labels",
         "additional_options",
-        "slider.value_throttled",
     )
-    def __panel__(self) -> pn.Column:
+    async def __panel__(self) -> pn.Column:
         """Returns the main content of the Trees page.
 
+        When the displayed trees move, e.g. by clicking through the trees,
+        the render waits briefly and is skipped if the trees have moved
+        again in the meantime, so only the trees the user stops at are
+        drawn.
+
         Returns:
             pn.Column: The layout for the main content area.
 
@@ -469,54 +658,84 @@ class Tree(View):
             self.position_index_warning.visible = True
             raise ValueError("Inputs for position or tree index are not valid")
 
-        sample_sets = self.datastore.individuals_table.sample_sets()
-        selected_samples = [
-            int(i) for sublist in list(sample_sets.values()) for i in sublist
-        ]
-        if len(selected_samples) < 1:
+        individuals = self.datastore.individuals_table.data.rx.value
+        selected = individuals["selected"].astype(bool)
+        if not selected.any():
             self.pack_unselected.value = False
             self.pack_unselected.disabled = True
         else:
             self.pack_unselected.disabled = False
         omit_sites, y_ticks = self.handle_advanced()
-        try:
-            node_labels = eval_options(self.node_labels)
-            additional_options = eval_options(self.additional_options)
-        except (ValueError, SyntaxError, TypeError):
-            node_labels = None
-            additional_options = None
-            self.advanced_warning.visible = True
+        ts = self.datastore.tsm.ts
+        if self.position is not None:
+            start_index = self.position_index()
+        else:
+            start_index = self.tree_index
+        style = self.default_css
+        # Several watched parameters often change together, e.g. position
+        # and then tree_index, so skip redrawing the same trees.
+        render_key = (
+            start_index,
+            self.num_trees.value,
+            self.width,
+            self.height,
+            self.symbol_size,
+            self.y_axis.value,
+            self.y_ticks.value,
+            self.x_axis.value,
+            self.sites_mutations.value,
+            self.pack_unselected.value,
+            self.node_labels,
+            self.additional_options,
+            style,
+        )
+        if render_key == self._render_key:
+            return self._layout
+        if self._render_key is not None and start_index != self._render_key[0]:
+            requested = (self.position, self.tree_index)
+            await asyncio.sleep(NAVIGATION_DELAY)
+            if (self.position, self.tree_index) != requested:
+                return self._layout
+        # Only collect the tracked samples once we know the trees are drawn;
+        # the selection is part of the render key through the node CSS.
+        selected_samples = np.fromiter(
+            itertools.chain.from_iterable(individuals.loc[selected, "nodes"]),
+            dtype=np.int32,
+        )
+        tracked = tuple(selected_samples.tolist())
         trees = []
+        # Walk along consecutive trees with a single tree object instead of
+        # seeking each one from scratch. The tree is kept between renders
+        # and only rebuilt when the tracked samples change, as seeking from
+        # the previous position is cheaper than building a new tree.
+        if self._tree is None or tracked != self._tree_tracked:
+            self._tree = tskit.Tree(ts, tracked_samples=selected_samples)
+            self._tree_tracked = tracked
+        tree = self._tree
+        tree.seek_index(start_index)
+        if self.position is None:
+            self.slider.value = int(tree.interval.left)
         for i in range(self.num_trees.value):
-            if self.position is not None:
-                tree = self.datastore.tsm.ts.at(self.position)
-                self.tree_index = tree.index
-                tree = self.datastore.tsm.ts.at_index(
-                    (tree.index + i), tracked_samples=selected_samples
-                )
-            else:
-                tree = self.datastore.tsm.ts.at_index(
-                    int(self.tree_index) + i, tracked_samples=selected_samples
-                )
-                self.slider.value = int(tree.get_interval()[0])
+            if i > 0:
+                tree.next()
             trees.append(
                 self.plot_tree(
-                    tree, omit_sites, y_ticks, node_labels, additional_options
+                    tree,
+                    omit_sites,
+                    y_ticks,
+                    self._node_labels,
+                    self._additional_options,
+                    style,
+                    tracked,
+                    i,
                 )
             )
-        all_trees = self.get_all_trees(trees)
-        return pn.Column(
-            all_trees,
-            pn.pane.Markdown(
-                """**Tree plot** - Lorem Ipsum...
-            Selected samples are marked with a black outline."""
-            ),
-            self.slider,
-            pn.Row(
-                self.param.prev,
-                self.param.next,
-            ),
-        )
+        self.get_all_trees(trees)
+        self._render_key = render_key
+        # Syncing the index re-triggers this method, which now hits the
+        # cached render.
+        self.tree_index = start_index
+        return self._layout
 
     def update_sidebar(self) -> pn.Column:
         """Renders the content of the sidebar based on searchBy value.
@@ -524,27 +743,13 @@ class Tree(View):
         Returns:
             pn.Column: The sidebar content.
         """
-        if self.search_by.value == "Tree Index":
+        by_index = self.search_by.value == "Tree Index"
+        if by_index:
             self.position = None
-            fields = [self.param.tree_index]
-        else:
-            fields = [self.param.position]
-
-        sidebar_content = pn.Column(
-            pn.Card(
-                self.search_by,
-                *fields,
-                self.param.width,
-                self.param.height,
-                collapsed=False,
-                title="Tree plotting options",
-                header_background=config.SIDEBAR_BACKGROUND,
-                active_header_background=config.SIDEBAR_BACKGROUND,
-                styles=config.VCARD_STYLE,
-            ),
-            self.position_index_warning,
-        )
-        return sidebar_content
+        # The sidebar is built once; toggling only swaps which input shows.
+        self._tree_index_input.visible = by_index
+        self._position_input.visible = not by_index
+        return self._sidebar
 
     @param.depends("search_by.value", watch=False)
     def sidebar(self) -> pn.Column:
@@ -1,9 +1,11 @@
 import os
 
+import diskcache
 import panel as pn
 import tskit
-from pytest import fixture
+from pytest import MonkeyPatch, fixture
 
+import tseda.cache
 from tseda import datastore, model
 
 dirname = os.path.abspath(os.path.dirname(__file__))
@@ -17,6 +19,29 @@ def port():
     return PORT[0]
 
 
+@fixture(scope="session")
+def browser_context_args(browser_context_args):
+    """
+    Open UI test pages at full HD size.
+    """
+    return {
+        **browser_context_args,
+        "viewport": {"width": 1920, "height": 1080},
+    }
+
+
+@fixture(scope="session", autouse=True)
+def disk_cache(tmp_path_factory):
+    """
+    Cache statistics computed by tests in a temporary directory instead of
+    the user's cache directory.
+    """
+    path = tmp_path_factory.mktemp("cache")
+    with diskcache.Cache(path) as cache, MonkeyPatch.context() as mp:
+        mp.setattr(tseda.cache, "get_cache", lambda: cache)
+        yield cache
+
+
 @fixture(autouse=True)
 def server_cleanup():
     """
@@ -28,36 +53,39 @@ def server_cleanup():
         pn.state.reset()
 
 
-@fixture
+@fixture(scope="session")
 def treesfile():
     return os.path.join(dirname, "data/test.trees")
 
 
-@fixture
+@fixture(scope="session")
 def tszipfile():
     return os.path.join(dirname, "data/test.trees.tsz")
 
 
-@fixture
+@fixture(scope="session")
 def tsbrowsefile():
     return os.path.join(dirname, "data/test.trees.tsbrowse")
 
 
-@fixture
+@fixture(scope="session")
 def tsedafile():
     return os.path.join(dirname, "data/test.trees.tseda")
 
 
-@fixture
+@fixture(scope="session")
 def ts(treesfile):
     return tskit.load(treesfile)
 
 
-@fixture
+@fixture(scope="session")
 def tsm(tsedafile):
     return model.TSModel(tsedafile)
 
 
+# The tree sequence and model are only read by tests, so they are loaded
+# once per session. The datastore tables are modified by selections, so
+# each test gets its own.
 @fixture
 def ds(tsm):
     individuals_table, sample_sets_table = datastore.make_tables(tsm)
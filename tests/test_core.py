@@ -0,0 +1,42 @@
+import numpy as np
+
+from tseda.vpages import core
+
+
+def test_compute_stat(ts):
+    calls = []
+
+    def diversity(*args, **kwargs):
+        calls.append(args)
+        return ts.diversity(*args, **kwargs)
+
+    sample_sets = [ts.samples()[:10], ts.samples()[10:20]]
+    key = ("diversity", "site", tuple(map(tuple, sample_sets)))
+    assert core.get_cached_stat(ts, key) is None
+    data = core.compute_stat(ts, key, diversity, sample_sets, mode="site")
+    cached = core.compute_stat(ts, key, diversity, sample_sets, mode="site")
+    assert len(calls) == 1
+    np.testing.assert_array_equal(data, cached)
+    np.testing.assert_array_equal(core.get_cached_stat(ts, key), data)
+
+
+def test_compute_stat_disk_cache(tsm, disk_cache):
+    ts = tsm.ts
+    sample_sets = [ts.samples()[:10]]
+    key = ("diversity", "site", tuple(map(tuple, sample_sets)))
+
+    def diversity(*args, **kwargs):
+        raise AssertionError("statistic should be read from disk")
+
+    # The tree sequence is shared by the session, so start without results
+    # cached in memory by other tests.
+    core._stats_cache.clear()
+    data = core.compute_stat(
+        ts, key, ts.diversity, sample_sets, disk_key=tsm.cache_key
+    )
+    assert ("stats", tsm.cache_key, key) in disk_cache
+    core._stats_cache.clear()
+    cached = core.compute_stat(
+        ts, key, diversity, sample_sets, disk_key=tsm.cache_key
+    )
+    np.testing.assert_array_equal(data, cached)
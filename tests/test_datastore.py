@@ -36,5 +36,12 @@ def test_individuals_table(individuals_table):
 
 
 def test_datastore(ds):
-    print(ds.color)
-    print(ds.sample_sets_table.color_by_name)
+    assert not ds.color.empty
+    assert ds.sample_sets_table.color_by_name
+
+
+def test_sample2ind_array(individuals_table):
+    sample2ind = individuals_table.sample2ind
+    arr = individuals_table.sample2ind_array
+    samples = np.array(list(sample2ind.keys()))
+    np.testing.assert_array_equal(arr[samples], list(sample2ind.values()))
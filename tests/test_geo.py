@@ -3,9 +3,16 @@ import geopandas
 
 def test_geo(ds):
     df = ds.individuals_table.data.rx.value
-    df = df.loc[df.selected]
+    mask = df["selected"].to_numpy(dtype=bool)
     gdf = geopandas.GeoDataFrame(
-        df.drop(["longitude", "latitude"], axis=1),
-        geometry=geopandas.points_from_xy(df.longitude, df.latitude),
+        {
+            column: df[column].to_numpy()[mask]
+            for column in df.columns
+            if column not in ("longitude", "latitude")
+        },
+        geometry=geopandas.points_from_xy(
+            df["longitude"].to_numpy()[mask], df["latitude"].to_numpy()[mask]
+        ),
     )
     assert isinstance(gdf, geopandas.GeoDataFrame)
+    assert len(gdf) == mask.sum()
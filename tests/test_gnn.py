@@ -15,9 +15,9 @@ def hapgnn(ds):
 
 def test_gnn(vbar):
     df = vbar.gnn()
-    print(df)
+    assert not df.empty
 
 
 def test_haplotype_gnn(hapgnn):
     df = hapgnn.datastore.haplotype_gnn(0)
-    print(df)
+    assert not df.empty
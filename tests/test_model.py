@@ -18,11 +18,13 @@ def test_individual(ts):
 
 
 def test_sample_set_init(ts):
-    for pop in ts.populations():
+    pops = list(ts.populations())
+    names = [json.loads(pop.metadata.decode())["population"] for pop in pops]
+    for pop, name in zip(pops, names):
         ss = model.SampleSet(pop.id, population=pop)
         assert ss is not None
         assert ss.sample_set_id == pop.id
-        assert ss.name == json.loads(pop.metadata.decode())["population"]
+        assert ss.name == name
         assert ss.color == ss.colormap[pop.id]
     ss = model.SampleSet(0, name="test")
     assert ss is not None
@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+
+from tseda.vpages import stats
+
+
+def test_set_multichoice_options(ds):
+    view = stats.MultiwayStats(datastore=ds)
+    sample_sets = ds.individuals_table.sample_sets()
+    view.set_multichoice_options(sample_sets)
+    options = view.comparisons.options
+    assert len(options) == len(sample_sets) * (len(sample_sets) - 1) // 2
+    view.set_multichoice_options(sample_sets)
+    assert view.comparisons.options is options
+
+
+def test_parallel_stat(ts, monkeypatch):
+    monkeypatch.setattr(stats, "MIN_BATCH_SIZE", 1)
+    sample_sets = [[s] for s in ts.samples()[:10]]
+    windows = [0, ts.sequence_length / 2, ts.sequence_length]
+    np.testing.assert_allclose(
+        stats.parallel_stat(ts.diversity, sample_sets, windows=windows),
+        ts.diversity(sample_sets, windows=windows),
+    )
+    indexes = list(itertools.combinations(range(len(sample_sets)), 2))
+    np.testing.assert_allclose(
+        stats.parallel_stat(
+            ts.divergence, sample_sets, indexes=indexes, windows=windows
+        ),
+        ts.divergence(sample_sets, indexes=indexes, windows=windows),
+    )
+
+
+def test_fst_from_divergence(ts):
+    sample_sets = [ts.samples()[:10], ts.samples()[10:20], ts.samples()[20:]]
+    indexes = [(0, 1), (0, 2), (1, 2)]
+    windows = [0, ts.sequence_length / 2, ts.sequence_length]
+    diversity = ts.diversity(sample_sets, windows=windows)
+    divergence = ts.divergence(sample_sets, indexes=indexes, windows=windows)
+    np.testing.assert_allclose(
+        stats.fst_from_divergence(diversity, divergence, indexes),
+        ts.Fst(sample_sets, indexes=indexes, windows=windows),
+    )
@@ -0,0 +1,70 @@
+import numpy as np
+import panel as pn
+import pytest
+
+from tseda.vpages import structure
+
+
+@pytest.fixture
+def sample_sets(ds):
+    sample_sets = ds.individuals_table.sample_sets()
+    assert len(sample_sets) > 1
+    return sample_sets
+
+
+def test_gnn(ds, sample_sets):
+    view = structure.GNN(datastore=ds)
+    assert isinstance(view.__panel__(), pn.Column)
+    df = view.gnn()
+    ts = ds.tsm.ts
+    gnn = ts.genealogical_nearest_neighbours(
+        [s for nodes in sample_sets.values() for s in nodes],
+        sample_sets=list(sample_sets.values()),
+    )
+    sizes = [len(nodes) for nodes in sample_sets.values()]
+    expected = np.array(
+        [rows.mean(axis=0) for rows in np.split(gnn, np.cumsum(sizes)[:-1])]
+    )
+    expected -= expected.mean(axis=0)
+    std = expected.std(axis=0)
+    expected = np.divide(
+        expected, std, out=np.zeros_like(expected), where=std > 0
+    )
+    assert df.shape == (len(sample_sets), len(sample_sets))
+    np.testing.assert_allclose(df.to_numpy(), expected)
+
+
+def test_gnn_zscore(ds, sample_sets):
+    data = structure.GNN(datastore=ds).gnn().to_numpy()
+    varying = data.std(axis=0) > 0
+    assert varying.any()
+    np.testing.assert_allclose(data.mean(axis=0), 0, atol=1e-12)
+    np.testing.assert_allclose(data[:, varying].std(axis=0, ddof=0), 1)
+
+
+def test_fst(ds, sample_sets):
+    view = structure.Fst(datastore=ds)
+    assert isinstance(view.__panel__(), pn.Column)
+    matrix = view.fst().to_numpy()
+    k = len(sample_sets)
+    assert matrix.shape == (k, k)
+    np.testing.assert_array_equal(matrix, matrix.T)
+    np.testing.assert_array_equal(np.diag(matrix), 0)
+    rows, cols = np.triu_indices(k, k=1)
+    np.testing.assert_allclose(
+        matrix[rows, cols],
+        ds.tsm.ts.Fst(
+            list(sample_sets.values()),
+            indexes=np.column_stack((rows, cols)),
+        ),
+    )
+
+
+def test_warning(ds):
+    ds.individuals_table.data.rx.value["selected"] = False
+    assert (
+        structure.GNN(datastore=ds).__panel__() is structure.GNN.warning_pane
+    )
+    assert (
+        structure.Fst(datastore=ds).__panel__() is structure.Fst.warning_pane
+    )
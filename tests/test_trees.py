@@ -1,4 +1,7 @@
+import asyncio
+
 import pytest
+import tskit
 
 from tseda.vpages import trees
 
@@ -13,6 +16,22 @@ def tree(ds):
     return trees.Tree(datastore=ds)
 
 
+@pytest.fixture
+def draws(monkeypatch):
+    """
+    Record the index of every tree drawn as svg.
+    """
+    draws = []
+    draw_svg = tskit.Tree.draw_svg
+
+    def counting_draw_svg(self, *args, **kwargs):
+        draws.append(self.index)
+        return draw_svg(self, *args, **kwargs)
+
+    monkeypatch.setattr(tskit.Tree, "draw_svg", counting_draw_svg)
+    return draws
+
+
 def test_treespage(treespage):
     assert treespage.title == "Trees"
     assert treespage.key == "trees"
@@ -22,3 +41,59 @@ def test_tree(tree):
     assert ".node.n26 > .sym {fill: #e4ae38}" in tree.default_css or (
         ".node.n26 > .sym {fill: #e4ae38}; stroke: black; stroke-width: 2px;"
     )
+
+
+def test_default_css_styles_every_sample(ds, tree):
+    css = tree.default_css
+    samples = list(ds.individuals_table.samples())
+    assert css.count(".sym") == len(samples)
+    assert f".node.n{samples[0]} > .sym " in css
+
+
+def test_position_index(ds, tree):
+    ts = ds.tsm.ts
+    for position in [0, ts.sequence_length / 2, ts.sequence_length - 1]:
+        tree.position = int(position)
+        assert tree.position_index() == ts.at(int(position)).index
+
+
+def test_widgets_per_instance(ds, tree):
+    other = trees.Tree(datastore=ds)
+    assert other.slider is not tree.slider
+    other.num_trees.value = 2
+    assert tree.num_trees.value == 1
+
+
+def test_render_one_tree(ds, tree, draws):
+    ts = ds.tsm.ts
+    tree.position = int(ts.sequence_length / 2)
+    index = ts.at(tree.position).index
+    asyncio.run(tree.__panel__())
+    assert tree.tree_index == index
+    assert f"Tree index {index} " in tree._tree_header.object
+    assert draws == [index]
+    # An identical render reuses the drawn tree
+    asyncio.run(tree.__panel__())
+    assert draws == [index]
+
+
+def test_render_two_trees(ds, tree, draws):
+    ts = ds.tsm.ts
+    tree.num_trees.value = 2
+    tree.tree_index = 1
+    asyncio.run(tree.__panel__())
+    titles = [accordion._names[0] for accordion in tree._trees_grid]
+    assert titles[0].startswith("Tree index 1 ")
+    assert titles[1].startswith("Tree index 2 ")
+    assert tree.tree_index == 1
+    assert tree.slider.value == int(ts.at_index(1).interval.left)
+    assert draws == [1, 2]
+    asyncio.run(tree.__panel__())
+    assert draws == [1, 2]
+
+
+def test_add_style(ds, tree):
+    svg = trees.add_style(ds.tsm.ts.first().draw_svg(), tree.default_css)
+    sample = next(ds.individuals_table.samples())
+    assert f".node.n{sample} > .sym " in svg
+    assert svg.endswith("</style></svg>")
@@ -1,50 +1,76 @@
+import socket
 import time
 
 import panel as pn
+import pytest
 from playwright.sync_api import expect
 
 from tseda import app, datastore
 
 CLICKS = 2
 
+# Pages are checked as soon as they render, allowing slow renders to take
+# up to this long (ms).
+TIMEOUT = 30_000
 
-def test_component(page, port, ds):
-    url = f"http://localhost:{port}"
+
+def wait_for_server(port, timeout=60):
+    """Waits until the server accepts connections on the port."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection(("localhost", port), timeout=1):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+@pytest.fixture
+def ui_server(port, ds):
+    """Serves the app and returns its url, stopping the server afterwards."""
     component = app.DataStoreApp(
         datastore=ds,
         title="TSEda Datastore App",
         views=[datastore.IndividualsTable],
     )
+    server = pn.serve(component.view, port=port, threaded=True, show=False)
+    wait_for_server(port)
+    yield f"http://localhost:{port}"
+    server.stop()
 
-    _ = pn.serve(component.view, port=port, threaded=True, show=False)
-    time.sleep(20)
-    page.goto(url)
 
-    page.set_viewport_size({"width": 1920, "height": 1080})
+@pytest.mark.ui
+def test_component(page, ui_server):
+    page.goto(ui_server)
 
     page.get_by_role("button", name="Individuals & sets").click()
-    time.sleep(10)
-    expect(page.get_by_text("Geomap").nth(0)).to_be_visible()
-    expect(page.get_by_text("Original population ID").nth(0)).to_be_visible()
-    expect(page.get_by_text("Create new sample set").nth(0)).to_be_visible()
+    expect(page.get_by_text("Geomap").nth(0)).to_be_visible(timeout=TIMEOUT)
+    expect(page.get_by_text("Original population ID").nth(0)).to_be_visible(
+        timeout=TIMEOUT
+    )
+    expect(page.get_by_text("Create new sample set").nth(0)).to_be_visible(
+        timeout=TIMEOUT
+    )
 
     page.get_by_role("button", name="Structure").click()
-    time.sleep(10)
-    expect(page.get_by_text("GNN cluster plot").nth(0)).to_be_visible()
-    expect(page.get_by_text("Structure").nth(0)).to_be_visible()
+    expect(page.get_by_text("GNN cluster plot").nth(0)).to_be_visible(
+        timeout=TIMEOUT
+    )
+    expect(page.get_by_text("Structure").nth(0)).to_be_visible(timeout=TIMEOUT)
 
     page.get_by_role("button", name="iGNN").click()
-    time.sleep(10)
     expect(
         page.get_by_text("Sample sets table quick view").nth(0)
-    ).to_be_visible()
+    ).to_be_visible(timeout=TIMEOUT)
 
     page.get_by_role("button", name="Statistics").click()
-    time.sleep(10)
     expect(
         page.get_by_text("Oneway statistics plotting options").nth(0)
-    ).to_be_visible()
+    ).to_be_visible(timeout=TIMEOUT)
 
     page.get_by_role("button", name="Trees").click()
-    time.sleep(10)
-    expect(page.get_by_text("Tree plotting options").nth(0)).to_be_visible()
+    expect(page.get_by_text("Tree plotting options").nth(0)).to_be_visible(
+        timeout=TIMEOUT
+    )